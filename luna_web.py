@@ -200,6 +200,164 @@ def get_body_longitudes_ts(t):
 
     return bodies
 
+# ---------- 月のカレンダー（月相・新月満月・ボイドタイム） ----------
+# 月−天体の離角：合・セクスタイル・スクエア・トライン・オポジション（両側）
+MAJOR_ASPECTS = {
+    0.0: "合",
+    60.0: "セクスタイル",
+    90.0: "スクエア",
+    120.0: "トライン",
+    180.0: "オポジション",
+    240.0: "トライン",
+    270.0: "スクエア",
+    300.0: "セクスタイル",
+}
+
+VOC_BODY_KEYS = {
+    "太陽": "sun",
+    "水星": "mercury",
+    "金星": "venus",
+    "火星": "mars",
+    "木星": "jupiter barycenter",
+    "土星": "saturn barycenter",
+    "天王星": "uranus barycenter",
+    "海王星": "neptune barycenter",
+    "冥王星": "pluto barycenter"
+}
+
+PHASE_NAMES = ["新月", "三日月", "上弦の月", "十三夜", "満月", "居待月", "下弦の月", "有明月"]
+
+# 月は1サインに最長でも約2.7日しか留まらないので、前後3日分あれば月初・月末のボイドも拾える
+CALENDAR_MARGIN_DAYS = 3
+
+def get_ecliptic_longitudes(t, key):
+    pos = EPH["earth"].at(t).observe(EPH[key])
+    _, lon, _ = pos.frame_latlon(ecliptic_frame)
+    return lon.degrees % 360.0
+
+def wrap_degrees(deg):
+    # -180〜180° に正規化
+    return (deg + 180.0) % 360.0 - 180.0
+
+def moon_offset_jd(jd, key, targets):
+    # 月黄経 −（天体黄経）− 目標角。key が None ならサイン境界（黄経そのもの）との差
+    t = TS.tt_jd(jd)
+    moon_lon = get_ecliptic_longitudes(t, "moon")
+    base_lon = get_ecliptic_longitudes(t, key) if key else 0.0
+    return wrap_degrees(moon_lon - base_lon - targets)
+
+def find_moon_crossings(jd, moon_lon, key, base_lon, targets):
+    """1時間刻みの黄経から目標角の通過を探し、はさみうち法でまとめて精密化する"""
+    targets = np.asarray(targets, dtype=float)
+    diff = wrap_degrees(moon_lon - base_lon - targets[:, None])
+
+    # 負→正への通過のみ（+180°→-180°の折り返しは除外）
+    rising = (diff[:, :-1] < 0.0) & (diff[:, 1:] >= 0.0) & (diff[:, 1:] - diff[:, :-1] < 90.0)
+    k, i = np.nonzero(rising)
+    if i.size == 0:
+        return np.empty(0), np.empty(0)
+
+    hit_targets = targets[k]
+    jd0, jd1 = jd[i], jd[i + 1]
+    d0, d1 = diff[k, i], diff[k, i + 1]
+    for _ in range(4):
+        jd_mid = jd0 - d0 * (jd1 - jd0) / (d1 - d0)
+        d_mid = moon_offset_jd(jd_mid, key, hit_targets)
+        below = d_mid < 0.0
+        jd0 = np.where(below, jd_mid, jd0)
+        d0 = np.where(below, d_mid, d0)
+        jd1 = np.where(below, jd1, jd_mid)
+        d1 = np.where(below, d1, d_mid)
+
+    roots = jd0 - d0 * (jd1 - jd0) / (d1 - d0)
+    order = np.argsort(roots)
+    return roots[order], hit_targets[order]
+
+def jd_to_local(jd_values, tz_offset_hours: int):
+    if len(jd_values) == 0:
+        return []
+    utc_list = TS.tt_jd(np.asarray(jd_values)).utc_datetime()
+    offset = datetime.timedelta(hours=tz_offset_hours)
+    return [dt.replace(tzinfo=None) + offset for dt in utc_list]
+
+@st.cache_data(show_spinner=False)
+def get_lunar_calendar(year: int, month: int, tz_offset_hours: int):
+    """1か月分の月相・新月満月・ボイドタイムを計算（月ごとにキャッシュして全訪問者で共有）"""
+    month_start = datetime.datetime(year, month, 1)
+    if month == 12:
+        month_end = datetime.datetime(year + 1, 1, 1)
+    else:
+        month_end = datetime.datetime(year, month + 1, 1)
+    num_days = (month_end - month_start).days
+
+    # 前後の余白を含めて1時間刻みの時刻配列を作り、各天体をまとめて計算
+    grid_start = month_start - datetime.timedelta(days=CALENDAR_MARGIN_DAYS, hours=tz_offset_hours)
+    num_hours = (num_days + 2 * CALENDAR_MARGIN_DAYS) * 24 + 1
+    t = TS.utc(grid_start.year, grid_start.month, grid_start.day,
+               grid_start.hour + np.arange(num_hours))
+    jd = t.tt
+
+    moon_lon = get_ecliptic_longitudes(t, "moon")
+    body_lons = {name: get_ecliptic_longitudes(t, key) for name, key in VOC_BODY_KEYS.items()}
+    phase = (moon_lon - body_lons["太陽"]) % 360.0
+
+    # 日ごとの月相（現地時刻の正午）
+    days = []
+    for d in range(num_days):
+        idx = (CALENDAR_MARGIN_DAYS + d) * 24 + 12
+        angle = float(phase[idx])
+        moon_sign, _ = split_sign_degree(moon_lon[idx])
+        days.append({
+            "date": (month_start + datetime.timedelta(days=d)).date(),
+            "phase_angle": angle,
+            "phase_name": PHASE_NAMES[int(((angle + 22.5) % 360.0) // 45)],
+            "moon_sign": moon_sign,
+        })
+
+    # 新月・満月
+    lunation_jd, lunation_targets = find_moon_crossings(jd, moon_lon, "sun", body_lons["太陽"], [0.0, 180.0])
+    lunation_lons = get_ecliptic_longitudes(TS.tt_jd(lunation_jd), "moon") if lunation_jd.size else []
+    lunations = []
+    for when, target, lon in zip(jd_to_local(lunation_jd, tz_offset_hours), lunation_targets, lunation_lons):
+        if month_start <= when < month_end:
+            sign, deg = split_sign_degree(lon)
+            lunations.append({
+                "type": "新月" if target == 0.0 else "満月",
+                "time": when,
+                "sign": sign,
+                "degree": float(deg),
+            })
+
+    # サイン移動（イングレス）と最後のメジャーアスペクト → ボイドタイム
+    ingress_jd, ingress_bounds = find_moon_crossings(jd, moon_lon, None, 0.0, np.arange(12) * 30.0)
+
+    aspect_jd, aspect_labels = [], []
+    for name, key in VOC_BODY_KEYS.items():
+        roots, angles = find_moon_crossings(jd, moon_lon, key, body_lons[name], list(MAJOR_ASPECTS))
+        aspect_jd.extend(roots)
+        aspect_labels.extend(f"{name}との{MAJOR_ASPECTS[a]}" for a in angles)
+    aspect_jd = np.asarray(aspect_jd)
+
+    void_of_course = []
+    for prev_jd, cur_jd, bound in zip(ingress_jd[:-1], ingress_jd[1:], ingress_bounds[1:]):
+        in_sign = np.nonzero((aspect_jd > prev_jd) & (aspect_jd < cur_jd))[0]
+        if in_sign.size:
+            last = in_sign[np.argmax(aspect_jd[in_sign])]
+            start_jd, last_aspect = aspect_jd[last], aspect_labels[last]
+        else:
+            start_jd, last_aspect = prev_jd, None
+
+        start, end = jd_to_local([start_jd, cur_jd], tz_offset_hours)
+        if end > month_start and start < month_end:
+            void_of_course.append({
+                "start": start,
+                "end": end,
+                "last_aspect": last_aspect,
+                "next_sign": SIGNS[int(round(bound / 30.0)) % 12],
+            })
+
+    return {"days": days, "lunations": lunations, "void_of_course": void_of_course}
+
 # ---------- ハウス（簡易イコールハウス） ----------
 def get_equal_houses():
     houses = {}
@@ -420,7 +578,7 @@ st.markdown(
 )
 
 # ---------- タブ構成 ----------
-tab1, tab2, tab3 = st.tabs(["🔮 ネイタル + トランジット", "💞 相性占い", "🃏 カードメッセージ"])
+tab1, tab2, tab3, tab4 = st.tabs(["🔮 ネイタル + トランジット", "💞 相性占い", "🃏 カードメッセージ", "🌗 ムーンカレンダー"])
 
 # === タブ1：ネイタル + トランジット ===
 with tab1:
@@ -646,10 +804,50 @@ with tab3:
         )
     st.markdown("</div>", unsafe_allow_html=True)
 
+# === タブ4：ムーンカレンダー ===
+with tab4:
+    st.markdown("<div class='luna-card'>", unsafe_allow_html=True)
+    st.markdown("<div class='luna-section-title'>月のカレンダー（月相・新月満月・ボイドタイム）</div>", unsafe_allow_html=True)
+
+    today = datetime.date.today()
+    col_cal1, col_cal2 = st.columns(2)
+    with col_cal1:
+        cal_year = st.number_input("年", min_value=1900, max_value=2050, value=min(today.year, 2050), key="cal_year")
+    with col_cal2:
+        cal_month = st.number_input("月", min_value=1, max_value=12, value=today.month, key="cal_month")
+
+    cal_tz_label = st.radio(
+        "表示するタイムゾーン",
+        ("日本（JST = UTC+9）", "世界時で計算（UTC・よく分からない場合）"),
+        key="cal_tz"
+    )
+    cal_tz_offset = 9 if cal_tz_label.startswith("日本") else 0
+
+    if st.button("🌗 月のカレンダーを見る", key="lunar_calendar"):
+        with st.spinner("月の動きを計算しています…"):
+            calendar = get_lunar_calendar(int(cal_year), int(cal_month), cal_tz_offset)
+
+        st.markdown("#### 🌑🌕 新月・満月")
+        for item in calendar["lunations"]:
+            st.write(f"{item['type']}：{item['time']:%m/%d %H:%M}（{item['sign']} {item['degree']:.2f}°）")
+
+        st.markdown("#### 🕳️ ボイドタイム（月が最後のメジャーアスペクトを終えてからサインを移るまで）")
+        for item in calendar["void_of_course"]:
+            last_aspect = item["last_aspect"] or "アスペクトなし"
+            st.write(
+                f"{item['start']:%m/%d %H:%M} 〜 {item['end']:%m/%d %H:%M}"
+                f"（{last_aspect} → {item['next_sign']}へ）"
+            )
+
+        st.markdown("#### 📅 日ごとの月相（正午）")
+        st.table([
+            {
+                "日付": f"{day['date']:%m/%d}",
+                "月相": day["phase_name"],
+                "位相角": f"{day['phase_angle']:.1f}°",
+                "月のサイン": day["moon_sign"],
+            }
+            for day in calendar["days"]
+        ])
 
-
-
-
-
-
-
+    st.markdown("</div>", unsafe_allow_html=True)